@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 from pathlib import Path
@@ -59,10 +60,16 @@ IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
 ADAPTER_IMAGE_FALLBACK_TEXTS = ("[image]", "[emoji]")
 
 
+@functools.lru_cache(maxsize=512)
 def looks_like_image_response(response: str) -> bool:
     """裸文件名形式的图片回复检测——避免把"详情见 chart.png"这类含空格句子，
     或 ``https://x/a.png`` 这类图片直链误判为本地图片协议。
 
+    结果只取决于 response 本身，而同一条回复内容每次动态命中都会重新分类（其中的
+    空白扫描按字符遍历整串），故做有界 memoize：热门命令命中即查表。相比在存储层
+    为每条命令落"是否图片"标记，免去 add/delete/load 三处的失效维护；512 条 ×
+    最长 2 万字符的键空间上限约几 MB，可接受。
+
     README 约定的图片语法是 ``.问：xx答：hello.png``——即整个 response 就是一个文件名，
     不带空格/换行、也不含 URL scheme。任何含空白字符或 ``://`` 的 response 都视为纯文本，
     即便以 ``.png`` 结尾：含空白的多半是句子，含 ``://`` 的几乎必然是图片直链，
@@ -84,9 +91,9 @@ PREFIX_PLACEHOLDER = r"[^\w\s]"
 # pattern 用这些常量拼接，is_reserved_trigger 也由它们派生：改一处即同步两处，
 # 避免新增/调整内置命令时 pattern 与保留词列表漂移（漂移会让同名动态 trigger 与
 # 内置命令互相抢占，或在数据里产生永不触发的幽灵命令）。
-# 这些关键字会被拼进 @Command 的正则 pattern 与带图添加的 re.match，但拼接处统一用
-# re.escape() 包裹（见 plugin.py 各 pattern 与 dispatcher.py 的 re.match），故即便值中含
-# 正则元字符也安全；调整关键字时无需再担心正则转义。
+# 这些关键字会被拼进 @Command 的正则 pattern（拼接处统一用 re.escape() 包裹，见
+# plugin.py 各 pattern），故即便值中含正则元字符也安全；带图添加路径不走正则，
+# 在 dispatcher.py 里作为 startswith / find 的字面量操作数使用，天然无转义问题。
 KW_ADD = "问："
 KW_ADD_ANSWER = "答："  # add 命令中 trigger 与 response 的分隔符
 KW_DELETE = "删："
@@ -106,9 +113,10 @@ _RESERVED_TRIGGER_EXACT = (KW_LIST,)
 def is_reserved_trigger(trigger: str) -> bool:
     """判断 trigger 是否与内置命令关键字冲突（即"保留词"）。
 
-    命中保留词的 trigger 即便写入数据也是"幽灵数据"：动态分发 hook 见到
-    ``<prefix><reserved>`` 会 return None 让位给精确 @Command，永不触发。
-    添加前校验、加载时清洗、动态分发放行三处共用本判断，避免逻辑漂移。
+    命中保留词的 trigger 即便写入数据也是"幽灵数据"：添加校验 + 加载清洗保证保留词
+    不会存在于命令库，动态分发 hook 查不到即放行、让位给精确 @Command，永不触发；
+    ``CommandService.respond`` 的命中路径另以本判断兜底，防异常数据抢答内置命令。
+    添加前校验、加载时清洗、respond 命中兜底三处共用本判断，避免逻辑漂移。
     """
     return trigger in _RESERVED_TRIGGER_EXACT or any(
         trigger.startswith(prefix) for prefix in _RESERVED_TRIGGER_PREFIXES
@@ -8,15 +8,18 @@ storage/images/scope，命令业务统一由 service 完成。
 注册，主程序"第一个 pattern 命中即独占"的分发器会让本插件抢走所有"前缀+任意字符"
 的消息，handler 查不到 trigger 时也不能让出——其他插件用同 prefix 的命令会被永久屏蔽。
 Hook 路径按 order 顺次执行，未 abort 就放行，彻底绕过 first-match-wins。
+同期移除的还有 v1 的 ThinkingInterceptor：它靠一个跨 handler 的 per-stream 标记集合
+（``set[str]``）在"命令命中"与"拦截思考回复"之间传状态，事件被跳过时标记不被消费、
+集合随长时运行无界增长。现在命中与拦截在本 hook 内同步决出（返回 abort 即拦截），
+不存在任何跨消息的 per-stream 状态，泄漏面连同类型一起消失。
 """
 
 from __future__ import annotations
 
 import logging
-import re
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from .common import KW_ADD, KW_ADD_ANSWER, is_reserved_trigger
+from .common import KW_ADD, KW_ADD_ANSWER
 
 if TYPE_CHECKING:
     from ..plugin import CustomCommandsPlugin
@@ -58,6 +61,21 @@ class DynamicDispatcher:
                     image_segs.append(seg)
         return "".join(text_parts), image_segs
 
+    @staticmethod
+    def _extract_context(message: Dict[str, Any]) -> Tuple[str, str, str]:
+        """从入站 message 提取 (stream_id, group_id, user_id)，缺失字段给空串。
+
+        dispatch 的两条分支（带图添加 / 动态触发）共用同一份会话上下文；在入口提取
+        一次传下去，而不是各分支自行翻一遍 message_info 嵌套 dict。
+        """
+        msg_info = message.get("message_info") or {}
+        user_info = msg_info.get("user_info") or {}
+        group_info = msg_info.get("group_info") or {}
+        stream_id = str(message.get("session_id") or "")
+        group_id = str(group_info.get("group_id") or "")
+        user_id = str(user_info.get("user_id") or "")
+        return stream_id, group_id, user_id
+
     @staticmethod
     def _pick_image(image_segs: List[Dict[str, Any]]) -> Tuple[str, str, int]:
         """取第一张带 binary_data_base64 的图片段，并统计有效图片总数。
@@ -117,37 +135,38 @@ class DynamicDispatcher:
         # clean_text 为空时（消息无 text 段）兜底 processed_plain_text。
         clean_text, image_segs = self._extract_text_and_images(message.get("raw_message"))
         base_text = clean_text.strip() or str(message.get("processed_plain_text") or "").strip()
+        # 统一前缀闸门：本插件处理的两类消息（带图添加 / 动态触发）文本都必须以
+        # 配置前缀开头——带图添加的解析本就要求「问：」紧随前缀。绝大多数入站
+        # 消息是普通聊天，不带前缀，在此一次 startswith 判空即可放行，后面的
+        # 会话上下文提取、带图添加解析与 trigger 查找全部不再发生。
+        if not base_text or not base_text.startswith(prefix):
+            return None
+
+        # 两条分支都要用的会话上下文：过闸门后才提取，不让普通聊天消息付这份解包成本
+        stream_id, group_id, user_id = self._extract_context(message)
 
         # 带图添加：<前缀>问：触发词答：[图片]。必须先于动态触发执行——带图添加文本的
-        # trigger 段以「问：」开头会被 is_reserved_trigger 判为保留词，而 @Command
-        # handle_add 的 pattern 要求「答：」后有 response、带图时「答：」后为空故不匹配，
-        # 若不在此抢先截获，这条消息会漏过命令路径直达 LLM。另外，Host 对 chat.receive.* hook
+        # trigger 段以「问：」开头（保留词，不可能存在于命令库，动态查找必然未命中放行），
+        # 而 @Command handle_add 的 pattern 要求「答：」后有 response、带图时「答：」后为空
+        # 故不匹配，若不在此抢先截获，这条消息会漏过命令路径直达 LLM。另外，Host 对 chat.receive.* hook
         # 的 message 默认携带二进制数据（hook_payloads.serialize_session_message 固定按
         # include_binary_data=True 序列化），raw_message 的 image/emoji 段才有 binary_data_base64；
         # 而 @Command 路径的 message 被显式以 include_binary_data=False 序列化、拿不到图，
         # 故带图添加只能在本 hook 完成（与装饰器声明的 include_binary_data 无关，详见 plugin.py）。
-        image_add_result = await self._try_image_add(message, prefix, base_text, image_segs)
+        image_add_result = await self._try_image_add(
+            prefix, base_text, image_segs, stream_id, group_id, user_id,
+        )
         if image_add_result is not None:
             return image_add_result
 
-        # 动态触发：基于 base_text 的「前缀 + 触发词」匹配
-        if not base_text or not base_text.startswith(prefix):
-            return None
-
+        # 动态触发：前缀已在上方闸门确认，这里直接切出触发词。
+        # 内置命令（保留词）无需在此前置判断：add 校验 + load 清洗保证保留词永远不在
+        # 命令库里，查不到即放行、自然落回精确 pattern 的 @Command——把保留词扫描挪到
+        # service.respond 的命中路径做防御兜底后，未命中路径就只剩一次 dict 查找。
         trigger = base_text[len(prefix):].strip()
         if not trigger:
             return None
 
-        # 内置命令交给精确 pattern 的 @Command 处理，避免与同名动态 trigger 冲突
-        if is_reserved_trigger(trigger):
-            return None
-
-        msg_info = message.get("message_info") or {}
-        user_info = msg_info.get("user_info") or {}
-        group_info = msg_info.get("group_info") or {}
-        stream_id = str(message.get("session_id") or "")
-        group_id = str(group_info.get("group_id") or "")
-        user_id = str(user_info.get("user_id") or "")
         if not stream_id:
             return None
 
@@ -156,18 +175,19 @@ class DynamicDispatcher:
         return {"action": "abort"} if hit else None
 
     async def _try_image_add(
-        self, message: Dict[str, Any], prefix: str,
-        base_text: str, image_segs: List[Dict[str, Any]],
+        self, prefix: str, base_text: str, image_segs: List[Dict[str, Any]],
+        stream_id: str, group_id: str, user_id: str,
     ) -> Optional[Dict[str, Any]]:
         """尝试把"<前缀>问：触发词答：[图片]"这条消息作为"带图添加"处理。
 
-        ``base_text`` 与 ``image_segs`` 由 dispatch 从 raw_message 统一重组后传入。
+        ``base_text`` 与 ``image_segs`` 由 dispatch 从 raw_message 统一重组后传入，
+        会话上下文三元组同样由 dispatch 经 ``_extract_context`` 提取一次后传入。
         图片排在文字前面或后面都可以——base_text 取自 raw_message 文本段重组，
         不受图文顺序影响。
 
         返回值语义：
         - ``None``                —— 不是带图添加场景（无图 / 文本不符合添加格式 /
-                                     无可回复会话），调用方继续走 reserved 判断与动态触发。
+                                     无可回复会话），调用方继续走动态触发的 trigger 查找。
         - ``{"action": "abort"}`` —— 已确认是带图添加，业务已交由 CommandService.add_image
                                      处理完毕（成功或失败都已回发消息），拦截后续主链。
         """
@@ -176,18 +196,21 @@ class DynamicDispatcher:
 
         if not base_text:
             return None
-        # 前缀校验由正则 ^<prefix>问： 承担；base_text 已不含占位符干扰。
-        match = re.match(rf"^{re.escape(prefix)}{re.escape(KW_ADD)}(?P<trigger>.+?){re.escape(KW_ADD_ANSWER)}", base_text)
-        if not match:
+        # 手工线性解析替代正则（原 pattern：``^<前缀>问：(?P<trigger>.+?)答：``）。
+        # 前缀已由 dispatch 闸门确认，这里只需验证「问：」紧随前缀、再 find 首个「答：」。
+        # 与原正则语义逐条对齐：trigger 至少 1 字符（「答：」紧贴「问：」时取下一个出现
+        # 位置，对应 .+? 的懒惰扩张）；trigger 不得含换行（. 不匹配 \n，「问：」「答：」
+        # 必须同行）。str.find 线性无回溯，用户可控的长文本没有 regex 最坏情形。
+        if not base_text.startswith(KW_ADD, len(prefix)):
             return None  # 有图但文本不符合添加格式 → 放行（带图触发或普通图片消息）
+        body = base_text[len(prefix) + len(KW_ADD):]
+        sep_idx = body.find(KW_ADD_ANSWER)
+        if sep_idx == 0:
+            sep_idx = body.find(KW_ADD_ANSWER, 1)
+        if sep_idx < 0 or "\n" in body[:sep_idx]:
+            return None  # 无分隔符或触发词跨行 → 同样放行
 
         # —— 确认是"带图添加"，此后无论成败都回发消息并 abort ——
-        msg_info = message.get("message_info") or {}
-        user_info = msg_info.get("user_info") or {}
-        group_info = msg_info.get("group_info") or {}
-        stream_id = str(message.get("session_id") or "")
-        group_id = str(group_info.get("group_id") or "")
-        user_id = str(user_info.get("user_id") or "")
         if not stream_id:
             return None  # 没有可回复的会话，交回主链
 
@@ -201,7 +224,7 @@ class DynamicDispatcher:
             )
             return {"action": "abort"}
 
-        trailing_text = base_text[match.end():].strip()
+        trailing_text = body[sep_idx + len(KW_ADD_ANSWER):].strip()
         if trailing_text:
             await self._plugin._service._send_text(
                 "❌ 带图添加时「答：」后请不要再填写文字；如需文本回复请不要附带图片",
@@ -210,7 +233,7 @@ class DynamicDispatcher:
             )
             return {"action": "abort"}
 
-        trigger = match.group("trigger").strip()
+        trigger = body[:sep_idx].strip()
         # 仅支持单张图片：取第一张带 binary_data_base64 的图片段，并拿到有效图片总数；
         # 多于一张时由 add_image 在成功回执里提示"仅保存第一张"，避免用户误以为多张都已绑定。
         b64_data, url_hint, valid_count = self._pick_image(image_segs)
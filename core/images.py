@@ -13,24 +13,117 @@ import hashlib
 import logging
 import os
 import re
+import threading
 import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncIterator, Optional, Tuple
 
 from .common import IMAGE_EXTENSIONS
 
+# pybase64 为可选加速依赖：SIMD（SSSE3/AVX2）实现的 base64 编码比 stdlib 快数倍，
+# 对 MB 级图片收益明显。未安装时回退 stdlib binascii 实现，输出完全一致、仅速度差异；
+# 不写入 manifest 硬依赖，避免给无编译轮子的平台添加装机门槛。
+try:
+    import pybase64 as _pybase64
+except ImportError:  # pragma: no cover - 取决于运行环境是否装有 pybase64
+    _pybase64 = None
+
 if TYPE_CHECKING:
     from ..plugin import CustomCommandsPlugin
 
 logger = logging.getLogger(__name__)
 
+
+def _b64encode_str(data: bytes) -> str:
+    """把图片字节编码成 base64 字符串；优先 pybase64（返回 str，免一次 decode）。"""
+    if _pybase64 is not None:
+        return _pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("utf-8")
+
+
+# 分块编码的读取粒度。必须是 3 的倍数：base64 每 3 字节原文编成 4 字符，按 3 对齐的
+# 块各自编码不产生中间 padding，结果可直接拼接。取 768KB（2^18×3）兼顾读吞吐与峰值
+# 内存——峰值从"整幅原始字节 + 完整编码串"降为"一块原始字节 + 完整编码串"。
+_ENCODE_CHUNK_BYTES = 768 * 1024
+
+
+def _b64encode_file(image_path: Path) -> str:
+    """流式读取文件并分块 base64 编码，避免整幅原始字节驻留内存。
+
+    I/O 失败上抛 OSError，由调用方统一归类错误文案。
+    """
+    parts: list[str] = []
+    with image_path.open("rb") as f:
+        while True:
+            chunk = f.read(_ENCODE_CHUNK_BYTES)
+            if not chunk:
+                break
+            parts.append(_b64encode_str(chunk))
+    return "".join(parts)
+
 # 带图添加自动落盘的图片文件名格式：cc_<16位 sha256 前缀><扩展名>（见 _save_bytes_sync）。
 # 仅这类「插件自动生成」的文件才在命令删除/覆盖后做孤儿回收；用户手动放进 image_directory
 # 的图片（如 hello.png）不匹配此模式，永远不会被自动删除。
 _MANAGED_IMAGE_FILE_RE = re.compile(r"^cc_[0-9a-f]{16}\.(?:png|jpe?g|gif|webp)$")
 
 
+class _EncodedImageCache:
+    """图片 base64 编码结果的有界 LRU 缓存，按编码后字符数计容量。
+
+    热门图片命令每次触发都要 read_bytes + b64encode 同一个文件；缓存后命中路径只剩
+    一次 ``stat()``（stat 仍然必须做——mtime_ns/size 作为新鲜度校验，文件被替换或
+    编辑后自动失效重读）。每个路径最多保留一个条目，旧版本在 put 时原位替换。
+
+    容量按编码后字符数（ASCII，约等于字节数）计而非条目数：单图最大
+    max_image_size(默认 10MB) 编码后约 13.3MB，按条目数设上限会让最坏内存不可控。
+    线程安全：读编码经 ``asyncio.to_thread`` 跑在线程池里，多个工作线程可能并发
+    访问，所有操作都持 ``threading.Lock``（临界区只有 dict 操作，极短）。
+    """
+
+    # 默认容量 32MB：够住两三张满额图片或几十张常规表情图，对插件体量是可忽略的常驻内存。
+    _DEFAULT_MAX_TOTAL_CHARS = 32 * 1024 * 1024
+
+    def __init__(self, max_total_chars: int = _DEFAULT_MAX_TOTAL_CHARS) -> None:
+        self._max_total_chars = max_total_chars
+        # path -> (mtime_ns, size, encoded)；OrderedDict 末端为最近使用
+        self._entries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[str]:
+        """命中且 mtime_ns/size 均一致时返回编码串并置为最近使用；否则返回 None。
+
+        新鲜度不符的旧条目就地移除（文件已变化，留着只占容量）。
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            cached_mtime_ns, cached_size, encoded = entry
+            if cached_mtime_ns != mtime_ns or cached_size != size:
+                del self._entries[path]
+                self._total_chars -= len(encoded)
+                return None
+            self._entries.move_to_end(path)
+            return encoded
+
+    def put(self, path: str, mtime_ns: int, size: int, encoded: str) -> None:
+        """写入编码结果；超出容量时从最久未用端逐出，单条超容的直接不缓存。"""
+        if len(encoded) > self._max_total_chars:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_chars -= len(old[2])
+            self._entries[path] = (mtime_ns, size, encoded)
+            self._total_chars += len(encoded)
+            while self._total_chars > self._max_total_chars:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._total_chars -= len(evicted)
+
+
 class ImageStore:
     """图片资源的安全存取与投递。"""
 
@@ -41,6 +134,12 @@ class ImageStore:
         self._managed_file_locks: dict[str, asyncio.Lock] = {}
         self._managed_file_lock_users: dict[str, int] = {}
         self._warned_absolute_image_dir: str = ""
+        # 图片 base64 编码结果的有界 LRU；mtime_ns/size 作新鲜度校验，文件变化自动失效
+        self._encoded_cache = _EncodedImageCache()
+        # resolve_dir 的结果缓存：(配置值, 插件目录) -> 解析后的绝对 Path。
+        # Path.resolve() 要逐级 readlink/stat，每次图片触发都付一遍没有必要；
+        # 配置热改或插件目录变化（键不同）自动重算。
+        self._resolved_dir_cache: Optional[Tuple[str, str, Path]] = None
 
     @asynccontextmanager
     async def managed_file_lock(self, filename: str) -> AsyncIterator[None]:
@@ -71,8 +170,16 @@ class ImageStore:
     def resolve_dir(self) -> Path:
         """将配置中的 image_directory 解析为绝对 Path。
         相对路径基于插件目录解析，绝对路径直接使用。
+
+        结果按 (配置值, 插件目录) 缓存——基准目录的符号链接解析视为运行期稳定
+        （目录由插件自建或用户一次性配置）；safe_path 对"基准目录 + 文件名"的逐次
+        resolve 不受影响，路径穿越防御保持原样。
         """
         configured = self._plugin.config.settings.image_directory
+        plugin_dir = self._plugin._plugin_dir
+        cached = self._resolved_dir_cache
+        if cached is not None and cached[0] == configured and cached[1] == plugin_dir:
+            return cached[2]
         path = Path(configured)
         if path.is_absolute():
             normalized = str(path)
@@ -83,9 +190,11 @@ class ImageStore:
                 )
                 self._warned_absolute_image_dir = normalized
         if not path.is_absolute():
-            base = Path(self._plugin._plugin_dir) if self._plugin._plugin_dir else Path.cwd()
+            base = Path(plugin_dir) if plugin_dir else Path.cwd()
             path = base / path
-        return path.resolve()
+        resolved = path.resolve()
+        self._resolved_dir_cache = (configured, plugin_dir, resolved)
+        return resolved
 
     def safe_path(self, response: str) -> Optional[Path]:
         """将回复内容解析为 image_directory 内的安全路径。
@@ -227,36 +336,54 @@ class ImageStore:
         async with self.managed_file_lock(filename):
             await _cleanup_after_file_lock()
 
-    @staticmethod
     def _read_and_encode_sync(
-        image_path: Path, max_size: int,
+        self, image_path: Path, max_size: int,
     ) -> Tuple[Optional[str], Optional[str]]:
         """同步读图片并 base64 编码；返回 (b64_data, error)。
 
         在异步路径上必须通过 ``asyncio.to_thread`` 调用——10MB 级别的
         ``read_bytes`` + ``base64.b64encode`` 在事件循环上会阻塞 100ms+。
+        编码结果进 ``_encoded_cache``：热门图片命令的重复触发只剩这里的一次
+        ``stat()``，新鲜度由 mtime_ns/size 保证（文件被替换即失效重读重编码）。
 
         Returns:
             (base64 字符串, None) 成功；
+            (None, "MISSING") 文件不存在，调用方据此回发"找不到图片"文案；
             (None, "OVERSIZE:{file_size}") 文件超过 max_size，调用方据此分流出友好错误；
             (None, 其它人类可读字符串) 其它 I/O 失败描述。
         """
+        # 存在性判断并入这里的 stat：不存在与超限一样走结构化错误码返回，
+        # 调用方无需先做一次独立的 exists()（那是每次触发多付一个 stat 系统调用）。
         try:
-            file_size = image_path.stat().st_size
+            stat_result = image_path.stat()
+        except FileNotFoundError:
+            return None, "MISSING"
         except OSError as e:
             return None, f"读取图片文件信息失败: {e}"
+        file_size = stat_result.st_size
         if file_size > max_size:
             return None, f"OVERSIZE:{file_size}"
+        cache_key = str(image_path)
+        cached = self._encoded_cache.get(cache_key, stat_result.st_mtime_ns, file_size)
+        if cached is not None:
+            return cached, None
         try:
-            data = image_path.read_bytes()
+            encoded = _b64encode_file(image_path)
         except OSError as e:
             return None, f"读取图片失败: {e}"
-        return base64.b64encode(data).decode("utf-8"), None
+        self._encoded_cache.put(cache_key, stat_result.st_mtime_ns, file_size, encoded)
+        return encoded, None
 
     async def dispatch_response(self, response_value: str, stream_id: str) -> None:
         """图片回复的完整链路：路径安全 → 存在 → 大小校验 → 读盘编码 → 发送。
 
         所有失败路径都向用户回发错误文案——hook 已经决定 abort，错误也算"已处理"。
+
+        为什么不按路径/裸字节发送、跳过 base64：SDK 的 ``send.image`` capability
+        （见 manifest）契约就是 base64 字符串，没有 path/bytes 形态；绕过 SDK 直调
+        napcat 的 ``file://`` 发图则要求适配器与插件共享同一文件系统（分离部署 /
+        容器化下不成立），且失去 ctx.send 的统一错误语义。编码成本已通过结果缓存
+        （热门命令零编码）、pybase64 与分块流式编码压到只在冷命中付一次。
         """
         p = self._plugin
         image_path = self.safe_path(response_value)
@@ -265,21 +392,22 @@ class ImageStore:
             await self._send_error_text("❌ 图片路径不合法", stream_id, context="图片路径非法提示")
             return
 
-        if not image_path.exists():
-            # 仅向用户展示文件名，不泄露服务器内部路径
-            await self._send_error_text(
-                f"❌ 找不到图片文件 '{response_value}'", stream_id,
-                context="图片不存在提示",
-            )
-            logger.warning("图片文件不存在: %s", image_path)
-            return
-
-        # 同步 I/O（stat + read + base64 编码）丢线程池跑，避免 10MB 级图片阻塞事件循环
+        # 同步 I/O（stat + read + base64 编码）丢线程池跑，避免 10MB 级图片阻塞事件循环。
+        # 文件存在性不再单独 exists() 预判——_read_and_encode_sync 的 stat 一并给出
+        # "MISSING" 错误码，省掉每次触发的一个重复 stat 系统调用。
         max_image_size = p.config.settings.max_image_size
         b64_img_data, encode_error = await asyncio.to_thread(
             self._read_and_encode_sync, image_path, max_image_size,
         )
         if encode_error:
+            if encode_error == "MISSING":
+                # 仅向用户展示文件名，不泄露服务器内部路径
+                await self._send_error_text(
+                    f"❌ 找不到图片文件 '{response_value}'", stream_id,
+                    context="图片不存在提示",
+                )
+                logger.warning("图片文件不存在: %s", image_path)
+                return
             if encode_error.startswith("OVERSIZE:"):
                 try:
                     actual_size = int(encode_error.split(":", 1)[1])
@@ -2,7 +2,7 @@
 
 ``ScopeResolver`` 集中管理 ``group_scopes`` 配置的迁移、解析、反向索引与运行时
 当前 scope 解析。不依赖 SDK ctx，也不依赖 core 内任何其它模块，是可独立测试、
-可被其它插件复用的纯 deep module。设计动机见 docs/adr/0005-scope-resolver.md。
+可被其它插件复用的纯 deep module。
 """
 
 from __future__ import annotations
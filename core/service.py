@@ -17,7 +17,8 @@ from __future__ import annotations
 import base64
 import logging
 import re
-from typing import TYPE_CHECKING, Optional, Tuple
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from .common import (
     ADAPTER_IMAGE_FALLBACK_TEXTS,
@@ -38,8 +39,16 @@ logger = logging.getLogger(__name__)
 class CommandService:
     """自定义命令的增删查与动态应答业务。"""
 
+    # .列表 文本缓存最多保留的作用域数：隔离模式下每个群/私聊都是独立作用域，
+    # 不设上限会随历史会话无界增长；超出后从最久未用端逐出（重建成本仅一次排序+join）。
+    _LIST_CACHE_MAX_SCOPES = 64
+
     def __init__(self, plugin: "CustomCommandsPlugin") -> None:
         self._plugin = plugin
+        # .列表 输出是 (数据版本, 前缀, 作用域) 的纯函数，按作用域缓存渲染结果：
+        # scope -> (data_version, prefix, triggers, list_content)。数据版本由
+        # CommandDataManager 在每次生效变更时递增，比对不等即重建，无需显式失效通知。
+        self._list_cache: "OrderedDict[str, Tuple[int, str, List[str], str]]" = OrderedDict()
 
     def _resolve_scope(self, group_id: str, user_id: str) -> Tuple[str, str]:
         """两路共用的作用域解析：返回 (原始 scope_id, 映射后的数据分区名)。"""
@@ -107,8 +116,8 @@ class CommandService:
             )
             return False, "回复内容过长", 1
 
-        # 触发词命中 hook 的 reserved 列表时，写入会变成幽灵数据：
-        # hook 见到 `.<reserved>` 直接 return None 让给 @Command，动态分发永不触达。
+        # 触发词命中保留词时，写入会变成幽灵数据：本校验保证保留词永不入库，动态分发
+        # hook 查不到即放行让给 @Command（respond 命中路径另有兜底），该 trigger 永不触达。
         if is_reserved_trigger(trigger):
             await self._send_text(
                 f"❌ 触发词「{trigger}」与内置命令冲突，请换一个", stream_id,
@@ -423,9 +432,9 @@ class CommandService:
         """列出命令：<前缀>列表。优先合并转发，任何失败降级纯文本。"""
         p = self._plugin
         scope_id, current_scope = self._resolve_scope(group_id, user_id)
-        triggers = p._data_manager.get_triggers_for_scope(current_scope)
         prefix = p.config.settings.command_prefix
 
+        triggers, list_content = self._cached_list_content(current_scope, prefix)
         if not triggers:
             await self._send_text(
                 f"🤷‍♀️ 当前作用域 [{current_scope}] 下没有可用的自定义命令",
@@ -435,8 +444,6 @@ class CommandService:
             return True, "列表已发送", 1
 
         header_text = build_list_header_text(scope_id, current_scope)
-        # triggers 已在 get_triggers_for_scope 中排序
-        list_content = "\n".join(f"▪️ {prefix}{trigger}" for trigger in triggers)
         # 优先用 Napcat 合并转发；任何失败（目标 ID 非法、转发被风控、内部异常）
         # 都降级为纯文本列表，保证用户至少能拿到命令清单。
         forward_failure: Optional[str] = None
@@ -468,6 +475,41 @@ class CommandService:
 
         return True, "列表已发送", 1
 
+    def _cached_list_content(self, scope: str, prefix: str) -> Tuple[List[str], str]:
+        """取（或重建）指定作用域的 .列表 触发词与渲染文本。
+
+        缓存键为作用域，条目内记录构建时的数据版本与前缀：任一不符即重建。
+        排序与逐行拼接的成本由此只在命令变更后的首次 .列表 付一次，而非每次调用。
+        空作用域不缓存（上层直接回"没有命令"，重建为一次空查询，缓存无收益）。
+        """
+        p = self._plugin
+        version = p._data_manager.version
+        entry = self._list_cache.get(scope)
+        if entry is not None and entry[0] == version and entry[1] == prefix:
+            self._list_cache.move_to_end(scope)
+            return entry[2], entry[3]
+
+        triggers = p._data_manager.get_triggers_for_scope(scope)  # 已排序
+        if not triggers:
+            self._list_cache.pop(scope, None)
+            return triggers, ""
+        # 平铺片段 + 一次 join：每行不经 f-string 格式化（免去逐行构造中间行字符串），
+        # 分配次数与行数线性。末尾 pop 掉最后一个换行，输出与原 "\n".join 逐字节一致。
+        parts: List[str] = []
+        append = parts.append
+        for trigger in triggers:
+            append("▪️ ")
+            append(prefix)
+            append(trigger)
+            append("\n")
+        parts.pop()
+        list_content = "".join(parts)
+        self._list_cache[scope] = (version, prefix, triggers, list_content)
+        self._list_cache.move_to_end(scope)
+        while len(self._list_cache) > self._LIST_CACHE_MAX_SCOPES:
+            self._list_cache.popitem(last=False)
+        return triggers, list_content
+
     # ===== 动态命中应答 =====
 
     async def respond(self, trigger: str, stream_id: str,
@@ -483,6 +525,13 @@ class CommandService:
         if response_value is None:
             return False
 
+        # 防御兜底：add 校验 + load 清洗保证保留词不会出现在命令库，正常永远走不到这里；
+        # 若数据在运行期被异常引入保留词 trigger，也必须让位给精确 pattern 的 @Command，
+        # 不能抢答。把该判断放在命中路径（罕见）而非每条前缀消息上，是动态分发只做
+        # 一次 dict 查找的前提（见 dispatcher.dispatch）。
+        if is_reserved_trigger(trigger):
+            return False
+
         if looks_like_image_response(response_value):
             try:
                 await p._images.dispatch_response(response_value, stream_id)
@@ -11,6 +11,7 @@ import json
 import logging
 import os
 import shutil
+import sys
 import time
 import uuid
 from pathlib import Path
@@ -18,9 +19,33 @@ from typing import Callable, Dict, List, Optional, Tuple
 
 from .common import DEFAULT_MAX_COMMANDS_PER_SCOPE
 
+# orjson 为可选加速依赖：Rust + SIMD 的 JSON 编解码比 stdlib 快数倍，命令多时缩短
+# 启动加载与每次编辑的持久化。未安装时回退 stdlib json，数据格式完全兼容、可互读
+# （唯一差异是缩进宽度：orjson 固定 2 空格，stdlib 路径沿用 4）。不写入 manifest
+# 硬依赖，与 images 模块的 pybase64 同一策略。
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境是否装有 orjson
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_bytes(data: Dict[str, Dict[str, str]]) -> bytes:
+    """把命令数据序列化成 UTF-8 字节串（优先 orjson，直接产出 bytes 免二次 encode）。"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
+
+def _loads_bytes(raw: bytes) -> object:
+    """从 UTF-8 字节串解析 JSON。orjson.JSONDecodeError 是 ValueError（且为
+    json.JSONDecodeError 子类），两条路径的失败都被调用方的同一 except 捕获。"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 class DataProtectionError(RuntimeError):
     """命令数据文件加载失败后进入保护模式，拒绝继续覆盖原文件。"""
 
@@ -33,12 +58,23 @@ class CommandDataManager:
 
     所有写操作通过 asyncio.Lock 保护，防止并发数据竞争。
     文件写入使用"临时文件 + 原子重命名"模式，防止崩溃导致数据损坏。
+
+    [为什么没有 write-behind / 延迟合并落盘]
+    add/delete 依赖 ``save()`` 同步抛出 OSError 来回滚内存改动并向管理员回报
+    "未持久化"；若把落盘推给后台队列合并，要么失去该保证（先回执成功、稍后
+    静默丢数据），要么得引入"待确认"状态机，复杂度远超收益——管理命令是低频
+    操作，序列化 + 单次写已在 ``asyncio.to_thread`` 线程里完成，不占事件循环。
     """
 
     def __init__(self) -> None:
         self.commands: Dict[str, Dict[str, str]] = {}
         self.file_path: Optional[Path] = None
         self._lock = asyncio.Lock()
+        # 内存数据的单调版本号：每次内存变更（load / add / delete / purge，含保存失败
+        # 后的回滚）+1。上层用它做派生缓存（如 .列表 文本）的失效判断，无需感知具体
+        # 改了什么。关键约束：递增必须与内存变更同步，使版本在任意 await 挂起点都
+        # 准确标识当前内存状态，否则挂起窗口内构建的缓存可能被登记在错误版本下。
+        self._version = 0
         # 加载已存在文件时发生解析/读取失败 → True。此时内存被重置为空库，若再落盘会覆盖
         # 用户原始（可能只是手工编辑出错、仍可修复）的数据，故运行期写入与卸载保存都要拒绝。
         self._load_failed = False
@@ -48,6 +84,11 @@ class CommandDataManager:
         """命令数据是否因加载失败进入保护模式。"""
         return self._load_failed
 
+    @property
+    def version(self) -> int:
+        """内存数据的单调版本号，随每次内存变更（含回滚）递增；供派生缓存比对失效。"""
+        return self._version
+
     def _ensure_writable(self) -> None:
         """保护模式下拒绝任何会覆盖 custom_commands.json 的写入。"""
         if self._load_failed:
@@ -66,6 +107,7 @@ class CommandDataManager:
         """
         self.file_path = Path(plugin_dir) / "custom_commands.json"
         self._load_failed = False
+        self._version += 1  # 无论哪条分支，load 都会整体替换内存数据，先行失效派生缓存
 
         # 文件不存在：新建空库。新建失败仅记日志，不算"加载失败"——没有原始数据需要保护，
         # 且若据此禁止保存，用户将永远无法落盘任何命令。
@@ -80,9 +122,8 @@ class CommandDataManager:
 
         # 文件存在：读取 + 解析。失败则备份原文件并标记 _load_failed，保护原始数据。
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
+            data = _loads_bytes(self.file_path.read_bytes())
+        except (ValueError, OSError) as e:
             logger.error(
                 "加载 '%s' 失败: %s；已备份原文件，卸载时将不会自动保存以免覆盖",
                 self.file_path.name, e,
@@ -114,7 +155,9 @@ class CommandDataManager:
                 isinstance(k, str) and isinstance(v, str)
                 for k, v in scope_val.items()
             ):
-                validated[scope_key] = scope_val
+                # trigger 作为 dict 键被动态分发逐消息查找：intern 后同一触发词在各作用域
+                # 共享同一字符串对象，键比较可走指针相等短路，也顺带去重内存。
+                validated[scope_key] = {sys.intern(k): v for k, v in scope_val.items()}
             else:
                 has_corrupt_scope = True
                 logger.warning("作用域 '%s' 数据格式异常，已跳过", scope_key)
@@ -167,8 +210,12 @@ class CommandDataManager:
             f".{self.file_path.name}.{uuid.uuid4().hex}.tmp"
         )
         try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(self.commands, f, ensure_ascii=False, indent=4)
+            # 先在内存一次性序列化，再整体写入：json.dump 直接对文件对象写会按 token 发起
+            # 大量小块 write 调用，serialize-then-write 把落盘收敛为单次写。命令库整体很小
+            # （每作用域 ≤500 条、回复 ≤2000 字符），完整字节串驻留内存的代价可忽略。
+            payload = _dumps_bytes(self.commands)
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
                 f.flush()
                 os.fsync(f.fileno())
             tmp_path.replace(self.file_path)  # 原子替换
@@ -226,6 +273,7 @@ class CommandDataManager:
         """
         async with self._lock:
             self._ensure_writable()
+            trigger = sys.intern(trigger)  # 与 load 同策：键 intern，查找比较快、跨作用域去重
             scope_created = scope not in self.commands
             if scope_created:
                 self.commands[scope] = {}
@@ -241,6 +289,11 @@ class CommandDataManager:
                 )
             old_value = self.commands[scope].get(trigger)
             self.commands[scope][trigger] = response
+            # 版本号必须紧跟内存变更递增：save() 的 await 挂起期间新值已对读者可见，
+            # 若此时版本仍是旧值，这个窗口里构建的派生缓存（如 .列表 文本）会把
+            # 变更后的数据登记在变更前的版本下——save 失败回滚后该缓存不会失效，
+            # 幽灵条目会一直存活到下一次成功变更。回滚分支同理再 +1。
+            self._version += 1
             try:
                 await self.save()
             except OSError:
@@ -252,6 +305,7 @@ class CommandDataManager:
                         del self.commands[scope]
                 else:
                     self.commands[scope][trigger] = old_value
+                self._version += 1  # 回滚也是一次内存变更，同样要让挂起窗口内的缓存失效
                 raise
             # 覆盖且新旧内容不同时，旧内容可能变孤儿；引用计数须在写入新值之后、锁内统计，
             # 避免与并发写操作看到不一致快照（同一图片 hash 去重后可被多个触发词共享）。
@@ -274,6 +328,7 @@ class CommandDataManager:
                 scope_removed = not self.commands[scope] and scope != "global"
                 if scope_removed:
                     del self.commands[scope]
+                self._version += 1  # 紧跟内存变更递增，勿移到 save 之后（理由见 add）
                 try:
                     await self.save()
                 except OSError:
@@ -281,6 +336,7 @@ class CommandDataManager:
                     if scope not in self.commands:
                         self.commands[scope] = {}
                     self.commands[scope][trigger] = old_value
+                    self._version += 1
                     raise
                 orphan = old_value if not self._is_referenced(old_value) else None
                 return True, orphan
@@ -297,11 +353,13 @@ class CommandDataManager:
             if "global" in self.commands and trigger in self.commands["global"]:
                 old_value = self.commands["global"][trigger]
                 del self.commands["global"][trigger]
+                self._version += 1  # 紧跟内存变更递增，勿移到 save 之后（理由见 add）
                 try:
                     await self.save()
                 except OSError:
                     # 保存失败：撤销删除，异常上抛由业务层回报"未持久化"。
                     self.commands["global"][trigger] = old_value
+                    self._version += 1
                     raise
                 orphan = old_value if not self._is_referenced(old_value) else None
                 return True, orphan
@@ -363,4 +421,6 @@ class CommandDataManager:
                 removed += 1
             if not bucket and scope != "global":
                 del self.commands[scope]
+        if removed:
+            self._version += 1
         return removed
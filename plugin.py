@@ -68,6 +68,11 @@ class CustomCommandsPlugin(MaiBotPlugin):
 
     config_model = CustomCommandsConfig
 
+    # @Command 装饰器声明的原始 pattern（仍含前缀占位符）备份，按组件名登记。
+    # 放在类属性而非实例属性：reload 会换新实例，但装饰器 metadata 可能是类级共享
+    # 对象，备份必须与 metadata 同生命周期才能在新实例上恢复原始模板。
+    _raw_command_patterns: Dict[str, str] = {}
+
     def __init__(self) -> None:
         super().__init__()
         # 不绑 plugin 的纯模块（无参构造）
@@ -75,7 +80,9 @@ class CustomCommandsPlugin(MaiBotPlugin):
         self._scope_resolver = ScopeResolver()
         # 生命周期状态
         self._plugin_dir: str = ""
-        self._admin_set: set[str] = set()  # 缓存管理员集合
+        # 缓存管理员集合：frozenset 表意"整体重建、从不原地增删"（on_load /
+        # on_config_update 各整体替换一次），O(1) 成员判断，误写即抛错
+        self._admin_set: frozenset[str] = frozenset()
         self._registered_prefix: Optional[str] = None  # 注册到主程序时使用的 prefix，用于检测热改
         self._self_reload_scheduled: bool = False  # 标记是否已调度自重载任务，防重入
         # 持有自重载 task 的强引用：asyncio.create_task 返回的 task 若无人引用，
@@ -118,11 +125,24 @@ class CustomCommandsPlugin(MaiBotPlugin):
             if not isinstance(metadata, dict):
                 continue
             pattern = metadata.get("command_pattern", "")
-            if not isinstance(pattern, str) or PREFIX_PLACEHOLDER not in pattern:
+            if not isinstance(pattern, str):
                 continue
+            # 幂等防护：若 SDK 在重载/重复收集时复用同一份 metadata dict，pattern 里的
+            # 占位符在首次替换后已消失，直接跳过会让改过的 prefix 静默沿用旧值。
+            # 首次见到仍含占位符的原始模板时按组件名登记备份，此后每次都从备份模板
+            # 重写——多次调用、prefix 热改后的重载都得到正确结果。
+            key = str(comp.get("name") or metadata.get("name") or "")
+            if PREFIX_PLACEHOLDER in pattern:
+                if key:
+                    self._raw_command_patterns[key] = pattern
+                raw_pattern = pattern
+            else:
+                raw_pattern = self._raw_command_patterns.get(key, "")
+                if PREFIX_PLACEHOLDER not in raw_pattern:
+                    continue  # 无占位符也无备份：不属于前缀重写范畴的 pattern，保持原样
             # count=1：只替换开头那个前缀占位符。当前 4 个 pattern 的占位都仅在 ^ 后出现一次，
             # 限定替换次数可防未来 pattern 在 trigger/response 段也用到 [^\w\s] 时被连带误替换。
-            metadata["command_pattern"] = pattern.replace(PREFIX_PLACEHOLDER, escaped_prefix, 1)
+            metadata["command_pattern"] = raw_pattern.replace(PREFIX_PLACEHOLDER, escaped_prefix, 1)
         self._registered_prefix = prefix
         return components
 
@@ -150,7 +170,7 @@ class CustomCommandsPlugin(MaiBotPlugin):
         )
 
         # 缓存管理员集合
-        self._admin_set = {str(uid) for uid in self.config.settings.admin_user_ids}
+        self._admin_set = frozenset(str(uid) for uid in self.config.settings.admin_user_ids)
 
         # 确保图片目录存在（基于插件目录解析，避免依赖文件夹的具体名称）
         try:
@@ -176,7 +196,7 @@ class CustomCommandsPlugin(MaiBotPlugin):
         """配置热重载回调。config_model 会自动更新 self.config。"""
         if scope == "self":
             # 刷新管理员缓存
-            self._admin_set = {str(uid) for uid in self.config.settings.admin_user_ids}
+            self._admin_set = frozenset(str(uid) for uid in self.config.settings.admin_user_ids)
             # 刷新作用域解析器
             self._scope_resolver.refresh(
                 group_scopes=self.config.settings.group_scopes,